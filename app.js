@@ -52,6 +52,15 @@ class GridTradingCalculator {
         this.tokenAmountInput = null;
 
         // Removed totalPnlAtTpInput
+
+        // Grid calculation worker state
+        this.gridWorker = null;
+        this.gridRequestInFlight = false;
+        this.gridRecomputePending = false;
+        this.gridPendingManualValues = {};
+        this.gridPendingSince = null;
+        this.gridRequestStart = null;
+        this.lastGridLatency = null;
     }
 
     initializeElements() {
@@ -136,6 +145,7 @@ class GridTradingCalculator {
 
     init() {
         console.log('Initializing calculator...');
+        this.initGridWorker();
         this.initializeElements();
     }
 
@@ -504,7 +514,35 @@ class GridTradingCalculator {
         this.calculateGrid();
     }
 
-    calculateGrid() {
+    initGridWorker() {
+        // Run grid calculations in a Web Worker when available, otherwise fall back to the main thread
+        if (typeof Worker === 'undefined') {
+            console.warn('Web Workers not supported, calculating grid on the main thread');
+            return;
+        }
+
+        try {
+            this.gridWorker = new Worker('gridWorker.js');
+            this.gridWorker.onmessage = (event) => this.handleGridWorkerMessage(event.data);
+            this.gridWorker.onerror = (error) => {
+                console.warn('Grid worker failed, falling back to main thread:', error.message);
+                error.preventDefault();
+                this.gridWorker.terminate();
+                this.gridWorker = null;
+                this.gridRequestInFlight = false;
+                this.gridRecomputePending = false;
+                this.gridPendingManualValues = {};
+                this.gridPendingSince = null;
+                this.calculateGrid();
+            };
+        } catch (error) {
+            // Workers cannot be created from file:// pages in some browsers
+            console.warn('Could not start grid worker, calculating on the main thread:', error);
+            this.gridWorker = null;
+        }
+    }
+
+    calculateGrid(manualValues = {}, requestedAt = performance.now()) {
         try {
             // Get and log input values
             const entryPrice = parseFloat(this.entryPriceInput.value) || 0;
@@ -516,19 +554,25 @@ class GridTradingCalculator {
             const gridMultiplier = parseFloat(this.gridMultiplierInput.value) || 0;
             const tradeSizeMultiplier = parseFloat(this.tradeSizeMultiplierInput.value) || 0;
             const tpPercent = parseFloat(this.tpPercentInput.value) || 0;
-            const manualInitialTradeValue = parseFloat(this.initialTradeValueInput.value) || 0;
-            const manualTpValue = parseFloat(this.tpValueInput.value) || 0;
+
+            // Values typed into these fields are used as-is instead of being recalculated.
+            // manualValues carries them over from inputs coalesced while a request was in flight.
+            const initialTradeValueFocused = document.activeElement === this.initialTradeValueInput;
+            const tpValueFocused = document.activeElement === this.tpValueInput;
+            const useManualInitialTradeValue = initialTradeValueFocused || manualValues.initialTradeValue !== undefined;
+            const useManualTpValue = tpValueFocused || manualValues.tpValue !== undefined;
+            const manualInitialTradeValue = initialTradeValueFocused || manualValues.initialTradeValue === undefined
+                ? parseFloat(this.initialTradeValueInput.value) || 0
+                : manualValues.initialTradeValue;
+            const manualTpValue = tpValueFocused || manualValues.tpValue === undefined
+                ? parseFloat(this.tpValueInput.value) || 0
+                : manualValues.tpValue;
 
             // Get the decimals from entry price for consistent formatting
             const entryPriceStr = this.entryPriceInput.value;
             const decimalPlaces = entryPriceStr.includes('.') ? entryPriceStr.split('.')[1].length : 2;
-            
-            // Custom price formatter to match entry price decimals
-            const formatMatchingDecimals = (value) => {
-                return value.toFixed(decimalPlaces);
-            };
 
-            console.log('Input values:', {
+            const params = {
                 entryPrice,
                 margin,
                 tradeSizePercent,
@@ -540,8 +584,12 @@ class GridTradingCalculator {
                 tpPercent,
                 manualInitialTradeValue,
                 manualTpValue,
+                useManualInitialTradeValue,
+                useManualTpValue,
                 decimalPlaces
-            });
+            };
+
+            console.log('Input values:', params);
 
             // Validate inputs
             if (!entryPrice || !leverage || !gridLevels || !gridSize || !gridMultiplier || !tradeSizeMultiplier) {
@@ -549,143 +597,122 @@ class GridTradingCalculator {
                 return;
             }
 
-            // Calculate initial values based on whether initialTradeValue was manually set
-            let initialTradeValue;
-            if (document.activeElement === this.initialTradeValueInput) {
-                initialTradeValue = manualInitialTradeValue;
-            } else {
-                initialTradeValue = (margin * tradeSizePercent) / 100;
-                this.initialTradeValueInput.value = formatMatchingDecimals(initialTradeValue);
-            }
-            
-            console.log('Initial calculations:', {
-                initialTradeValue
-            });
-            
-            // Calculate take profit values
-            const tpPrice = entryPrice * (1 + ((tpPercent / 100) / leverage));
-            if (this.tpPriceInput) {
-                this.tpPriceInput.value = formatMatchingDecimals(tpPrice);
+            if (!this.gridWorker) {
+                this.renderGridResults(computeGrid(params));
+                this.recordGridLatency(requestedAt, gridLevels);
+                return;
             }
 
-            // Calculate price move to TP in dollars (with leverage properly accounted for)
-            const priceMoveToTP = tpPrice - entryPrice;
-            if (this.priceMoveToTPInput) {
-                this.priceMoveToTPInput.value = formatMatchingDecimals(priceMoveToTP);
+            // Keep at most one request in flight; inputs arriving meanwhile are
+            // coalesced into a single recompute when it returns
+            if (this.gridRequestInFlight) {
+                this.gridRecomputePending = true;
+                // Focus may have moved on by the time the recompute runs, so keep
+                // the manual fields as they were for the latest input
+                this.gridPendingManualValues = {};
+                if (useManualInitialTradeValue) {
+                    this.gridPendingManualValues.initialTradeValue = manualInitialTradeValue;
+                }
+                if (useManualTpValue) {
+                    this.gridPendingManualValues.tpValue = manualTpValue;
+                }
+                if (this.gridPendingSince === null) {
+                    this.gridPendingSince = requestedAt;
+                }
+                return;
             }
 
-            // Calculate price move to TP as percentage (with leverage properly accounted for)
-            const priceMoveToTPPercent = ((tpPrice - entryPrice) / entryPrice) * 100;
-            if (this.priceMoveToTPPercentInput) {
-                this.priceMoveToTPPercentInput.value = priceMoveToTPPercent.toFixed(2);
-            }
+            this.gridRequestInFlight = true;
+            this.gridRequestStart = requestedAt;
+            this.gridWorker.postMessage(params);
+        } catch (error) {
+            console.error('Error calculating grid:', error);
+        }
+    }
 
-            // Calculate TP value based on whether it was manually set
-            let tpValue;
-            if (document.activeElement === this.tpValueInput) {
-                tpValue = manualTpValue;
-            } else {
-                // TP Value is the profit (percentage of initial trade value with leverage)
-                tpValue = initialTradeValue * (tpPercent / 100) * leverage;
-                this.tpValueInput.value = formatMatchingDecimals(tpValue);
-            }
+    handleGridWorkerMessage({ result, error }) {
+        this.gridRequestInFlight = false;
 
-            // Calculate grid levels
-            const gridLevelsData = [];
-            let totalTradeSize = initialTradeValue; // Include initial position
-            let totalWeightedPrice = entryPrice * initialTradeValue;
-            let totalPositionSize = initialTradeValue * leverage;
-            
-            // Add level 0 (initial trade)
-            gridLevelsData.push({
-                level: 0,
-                price: formatMatchingDecimals(entryPrice),
-                gridSize: 0, // No grid size for initial trade
-                tradeSize: formatMatchingDecimals(initialTradeValue),
-                positionSize: formatMatchingDecimals(initialTradeValue * leverage),
-                requiredMargin: formatMatchingDecimals(initialTradeValue),
-                percentFromEntry: "0.00",
-                pnlAtTp: formatMatchingDecimals((tpPrice - entryPrice) * (initialTradeValue * leverage) / entryPrice)
-            });
-            
-            let currentGridSize = gridSize;
-            
-            for (let i = 0; i < gridLevels; i++) {
-                // Calculate grid size for this level (from entry price)
-                if (i > 0) {
-                    currentGridSize = gridSize * Math.pow(gridMultiplier, i);
-                }
-                
-                // Calculate price based on entry price (not previous level)
-                const priceLevel = entryPrice * (1 - ((currentGridSize * (i + 1)) / 100));
-                
-                // Calculate trade size with linear scaling
-                // Add 1 to i so first grid level (-1) starts with the multiplier
-                const tradeSize = initialTradeValue * (1 + ((i + 1) * (tradeSizeMultiplier - 1)));
-                
-                const positionSize = tradeSize * leverage;
-                const requiredMargin = tradeSize;
-                const percentFromEntry = ((priceLevel - entryPrice) / entryPrice) * 100;
-                
-                // Calculate PnL at TP considering actual price movement from this level
-                const pnlAtTp = (tpPrice - priceLevel) * (positionSize / priceLevel);
-                
-                console.log(`Grid Level ${i + 1}:`, {
-                    currentGridSize,
-                    priceLevel,
-                    tradeSize,
-                    positionSize,
-                    requiredMargin,
-                    percentFromEntry,
-                    pnlAtTp
-                });
-                
-                gridLevelsData.push({
-                    level: -(i + 1),
-                    price: formatMatchingDecimals(priceLevel),
-                    gridSize: currentGridSize,
-                    tradeSize: formatMatchingDecimals(tradeSize),
-                    positionSize: formatMatchingDecimals(positionSize),
-                    requiredMargin: formatMatchingDecimals(requiredMargin),
-                    percentFromEntry: percentFromEntry.toFixed(2),
-                    pnlAtTp: formatMatchingDecimals(pnlAtTp)
-                });
-                
-                totalTradeSize += tradeSize;
-                totalWeightedPrice += priceLevel * tradeSize;
-                totalPositionSize += positionSize;
-            }
+        if (error) {
+            console.error('Error calculating grid:', error);
+        } else {
+            this.renderGridResults(result);
+            this.recordGridLatency(this.gridRequestStart, result.gridLevelsData.length - 1);
+        }
 
-            // Calculate required margin and average entry
-            const requiredMargin = totalTradeSize;
-            const averageEntryPrice = totalWeightedPrice / totalTradeSize;
+        if (this.gridRecomputePending) {
+            const manualValues = this.gridPendingManualValues;
+            const pendingSince = this.gridPendingSince;
+            this.gridRecomputePending = false;
+            this.gridPendingManualValues = {};
+            this.gridPendingSince = null;
+            this.calculateGrid(manualValues, pendingSince);
+        }
+    }
 
-            // Calculate effective leverage
-            const effectiveLeverage = totalPositionSize / totalTradeSize;
+    recordGridLatency(start, levels) {
+        // Input to DOM update: covers the worker round trip, rendering and the table diff,
+        // but not the browser's own style, layout and paint work that follows
+        const end = performance.now();
+        this.lastGridLatency = end - start;
+        if (performance.measure) {
+            performance.measure('grid-recompute', { start, end });
+        }
+        console.log(`Grid recompute: ${this.lastGridLatency.toFixed(2)} ms for ${levels} levels`);
+    }
 
-            console.log('Final calculations:', {
-                requiredMargin,
-                averageEntryPrice,
-                totalTradeSize,
-                totalWeightedPrice
-            });
+    renderGridResults(result) {
+        try {
+            // Custom price formatter to match entry price decimals
+            const formatMatchingDecimals = (value) => {
+                return value.toFixed(result.decimalPlaces);
+            };
+
+            // Don't overwrite fields the user typed into, whether for this result,
+            // the recompute still pending, or the field that currently has focus
+            if (!result.useManualInitialTradeValue &&
+                this.gridPendingManualValues.initialTradeValue === undefined &&
+                document.activeElement !== this.initialTradeValueInput) {
+                this.initialTradeValueInput.value = formatMatchingDecimals(result.initialTradeValue);
+            }
+            if (!result.useManualTpValue &&
+                this.gridPendingManualValues.tpValue === undefined &&
+                document.activeElement !== this.tpValueInput) {
+                this.tpValueInput.value = formatMatchingDecimals(result.tpValue);
+            }
 
-            // Calculate number of tokens for initial trade (without leverage)
-            const tokenAmount = initialTradeValue / entryPrice;
+            if (this.tpPriceInput) {
+                this.tpPriceInput.value = formatMatchingDecimals(result.tpPrice);
+            }
+            if (this.priceMoveToTPInput) {
+                this.priceMoveToTPInput.value = formatMatchingDecimals(result.priceMoveToTP);
+            }
+            if (this.priceMoveToTPPercentInput) {
+                this.priceMoveToTPPercentInput.value = result.priceMoveToTPPercent.toFixed(2);
+            }
             if (this.tokenAmountInput) {
-                this.tokenAmountInput.value = formatMatchingDecimals(tokenAmount);
+                this.tokenAmountInput.value = formatMatchingDecimals(result.tokenAmount);
             }
 
+            console.log('Final calculations:', {
+                requiredMargin: result.totalTradeSize,
+                averageEntryPrice: result.averageEntryPrice,
+                totalTradeSize: result.totalTradeSize
+            });
+
             // Update grid levels table
-            this.updateGridLevelsTable(gridLevelsData);
+            this.updateGridLevelsTable(result.gridLevelsData);
 
-            // Calculate risk metrics
-            const liquidationPrice = entryPrice * (1 - (1 / leverage));
-            const maxDrawdown = ((entryPrice - liquidationPrice) / entryPrice) * 100;
-            const maxProfit = ((tpPrice - averageEntryPrice) / averageEntryPrice) * 100 * leverage;
-            const riskRewardRatio = Math.abs(maxProfit / maxDrawdown);
-            const marginUtilization = (totalTradeSize / margin) * 100;
-            const liquidationDistance = ((entryPrice - liquidationPrice) / entryPrice) * 100;
+            const {
+                totalTradeSize,
+                averageEntryPrice,
+                liquidationPrice,
+                maxDrawdown,
+                maxProfit,
+                riskRewardRatio,
+                marginUtilization,
+                liquidationDistance
+            } = result;
 
             // Update risk metrics UI with proper formatting
             const totalInvestmentElement = document.getElementById('totalInvestment');
@@ -727,32 +754,57 @@ class GridTradingCalculator {
                      liquidationDistance < 20 ? 'text-warning' : 'text-success');
             }
         } catch (error) {
-            console.error('Error calculating grid:', error);
+            console.error('Error rendering grid:', error);
         }
     }
 
     updateGridLevelsTable(gridLevelsData) {
-        const tableContent = gridLevelsData.map(level => {
+        if (!this.gridLevelsTableBody) {
+            return;
+        }
+
+        // Reuse existing rows and only touch cells whose text changed
+        const tableBody = this.gridLevelsTableBody;
+        while (tableBody.rows.length > gridLevelsData.length) {
+            tableBody.deleteRow(-1);
+        }
+
+        const newRows = document.createDocumentFragment();
+        gridLevelsData.forEach((level, index) => {
+            let row = tableBody.rows[index];
+            if (!row) {
+                row = document.createElement('tr');
+                for (let i = 0; i < 8; i++) {
+                    row.appendChild(document.createElement('td'));
+                }
+                newRows.appendChild(row);
+            }
+
             const levelClass = level.level === 0 ? 'table-primary' : '';
             const gridSizeDisplay = level.level === 0 ? '-' : `${level.gridSize.toFixed(2)}%`;
-            
-            return `
-                <tr class="${levelClass}">
-                    <td>${level.level}</td>
-                    <td>${level.price}</td>
-                    <td>${gridSizeDisplay}</td>
-                    <td>${level.tradeSize}</td>
-                    <td>${level.positionSize}</td>
-                    <td>${level.requiredMargin}</td>
-                    <td>${level.percentFromEntry}%</td>
-                    <td>${level.pnlAtTp}</td>
-                </tr>
-            `;
-        }).join('');
+            const cellValues = [
+                String(level.level),
+                level.price,
+                gridSizeDisplay,
+                level.tradeSize,
+                level.positionSize,
+                level.requiredMargin,
+                `${level.percentFromEntry}%`,
+                level.pnlAtTp
+            ];
+
+            if (row.className !== levelClass) {
+                row.className = levelClass;
+            }
+            cellValues.forEach((value, cellIndex) => {
+                const cell = row.cells[cellIndex];
+                if (cell.textContent !== value) {
+                    cell.textContent = value;
+                }
+            });
+        });
 
-        if (this.gridLevelsTableBody) {
-            this.gridLevelsTableBody.innerHTML = tableContent;
-        }
+        tableBody.appendChild(newRows);
     }
 
     formatUSDT(value) {
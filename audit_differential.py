@@ -0,0 +1,584 @@
+"""Differential audit of the grid calculators.
+
+The grid math exists in several places that do not agree with each other:
+calc_verification.py, audit_calculations.py, verify_calculations.py and the
+browser engine in gridWorker.js (used by app.js). This script checks the
+complete output of each one against the golden results in
+golden/grid_calculations.json, then runs the same random configs through every
+implementation and reports where the fields they share diverge from the app
+engine and which basic properties they break.
+
+Golden mismatches fail the run (exit code 1), so it can gate rewrites of any
+single calculator without tripping on the known differences between them. An
+implementation that cannot run here or has no golden results also fails the run
+unless --allow-skip is given.
+
+Usage:
+    python audit_differential.py                  # golden check + 100K random cases
+    python audit_differential.py --cases 0        # golden check only
+    python audit_differential.py --update-golden  # regenerate golden results
+"""
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+from array import array
+
+from audit_calculations import calculate_audit_grid
+from calc_verification import (
+    calculate_grid_levels, calculate_initial_trade_value, calculate_token_amount, calculate_tp_values
+)
+
+try:
+    from verify_calculations import verify_grid_calculations
+except ImportError as e:
+    # verify_calculations imports requests at module level
+    verify_grid_calculations = None
+    VERIFY_IMPORT_ERROR = str(e)
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+GRID_WORKER_FILE = os.path.join(ROOT_DIR, "gridWorker.js")
+GOLDEN_FILE = os.path.join(ROOT_DIR, "golden", "grid_calculations.json")
+
+GOLDEN_SEED = 20240124
+GOLDEN_CASES = 100
+# The last golden cases are forced to these level counts so large grids are always covered
+GOLDEN_LARGE_LEVELS = [100, 250, 500]
+# Share of random cases drawn with 100-500 levels instead of 1-10
+LARGE_GRID_FRACTION = 0.01
+REFERENCE = "app"
+REL_TOLERANCE = 1e-9
+# Absolute tolerances for fields an implementation rounds before returning
+ROUNDING_TOLERANCES = {
+    "verify_calculations": {"tp_price": 0.5e-8, "total_margin": 0.005}
+}
+FIELDS = ["prices", "trade_sizes", "position_sizes", "pnl_at_tp", "tp_price", "average_entry", "total_margin"]
+
+CONFIG_FIELDS = [
+    "entry_price", "margin", "trade_size_percent", "leverage", "grid_levels",
+    "grid_size", "grid_multiplier", "trade_size_multiplier", "tp_percent"
+]
+
+# Maps the JSON configs on stdin to computeGrid() params, shared by both drivers below
+NODE_PARAMS = r"""
+const toParams = c => ({
+    entryPrice: c[0],
+    margin: c[1],
+    tradeSizePercent: c[2],
+    leverage: c[3],
+    gridLevels: c[4],
+    gridSize: c[5],
+    gridMultiplier: c[6],
+    tradeSizeMultiplier: c[7],
+    tpPercent: c[8],
+    manualInitialTradeValue: 0,
+    manualTpValue: 0,
+    useManualInitialTradeValue: false,
+    useManualTpValue: false,
+    decimalPlaces: 20
+});
+"""
+
+# Writes every computeGrid() result as JSON for the golden check. Non-finite numbers are
+# written as strings so NaN and Infinity stay distinguishable from each other and from null.
+NODE_OUTPUT_DRIVER = r"""
+const fs = require('fs');
+const vm = require('vm');
+vm.runInThisContext(fs.readFileSync(process.argv[1], 'utf8'));
+""" + NODE_PARAMS + r"""
+const configs = JSON.parse(fs.readFileSync(0, 'utf8'));
+const results = configs.map(c => computeGrid(toParams(c)));
+process.stdout.write(JSON.stringify(results, (key, value) =>
+    typeof value === 'number' && !Number.isFinite(value) ? String(value) : value));
+"""
+
+# Faster driver for the differential run. Reads configs as packed doubles in CONFIG_FIELDS
+# order and writes per case the level prices, trade sizes, position sizes and PnL at TP
+# followed by tp_price, average_entry and total_margin, also as doubles.
+NODE_SHARED_DRIVER = r"""
+const fs = require('fs');
+const vm = require('vm');
+vm.runInThisContext(fs.readFileSync(process.argv[1], 'utf8'));
+""" + NODE_PARAMS + r"""
+const input = fs.readFileSync(0);
+const configs = new Float64Array(input.buffer, input.byteOffset, input.length / 8);
+const output = [];
+for (let i = 0; i < configs.length; i += 9) {
+    const r = computeGrid(toParams(configs.subarray(i, i + 9)));
+    const levels = r.gridLevelsData.slice(1);
+    for (const key of ['price', 'tradeSize', 'positionSize', 'pnlAtTp']) {
+        for (const level of levels) {
+            output.push(Number(level[key]));
+        }
+    }
+    output.push(r.tpPrice, r.averageEntryPrice, r.totalTradeSize);
+}
+process.stdout.write(new Uint8Array(new Float64Array(output).buffer));
+"""
+
+
+def random_config(rng):
+    """Generate a random but plausible grid configuration"""
+    return {
+        "entry_price": 10 ** rng.uniform(-3, 5),
+        "margin": rng.uniform(100, 100000),
+        "trade_size_percent": rng.uniform(1, 50),
+        "leverage": rng.uniform(1, 20),
+        "grid_levels": rng.randint(100, 500) if rng.random() < LARGE_GRID_FRACTION else rng.randint(1, 10),
+        "grid_size": rng.uniform(0.1, 10),
+        "grid_multiplier": rng.uniform(0.5, 1.5),
+        "trade_size_multiplier": rng.uniform(1, 2),
+        "tp_percent": rng.uniform(1, 100)
+    }
+
+
+def generate_configs(seed, count):
+    rng = random.Random(seed)
+    return [random_config(rng) for _ in range(count)]
+
+
+def generate_golden_configs():
+    configs = generate_configs(GOLDEN_SEED, GOLDEN_CASES)
+    for config, grid_levels in zip(configs[-len(GOLDEN_LARGE_LEVELS):], GOLDEN_LARGE_LEVELS):
+        config["grid_levels"] = grid_levels
+    return configs
+
+
+def normalize_levels(levels, **totals):
+    """Convert a list of grid level dicts to the shared result format, skipping level 0"""
+    levels = [level for level in levels if level.get("level") != 0]
+    result = {
+        "prices": [level["price"] for level in levels],
+        "trade_sizes": [level["trade_size"] for level in levels],
+        "position_sizes": [level["position_size"] for level in levels]
+    }
+    if all("pnl_at_tp" in level for level in levels):
+        result["pnl_at_tp"] = [level["pnl_at_tp"] for level in levels]
+    result.update(totals)
+    return result
+
+
+def calc_verification_outputs(configs):
+    results = []
+    for c in configs:
+        initial_trade_value = calculate_initial_trade_value(c["margin"], c["trade_size_percent"])
+        results.append({
+            "initial_trade_value": initial_trade_value,
+            "token_amount": calculate_token_amount(initial_trade_value, c["entry_price"]),
+            "tp_values": calculate_tp_values(c["entry_price"], c["tp_percent"], c["leverage"], initial_trade_value),
+            "grid": calculate_grid_levels(
+                c["entry_price"], initial_trade_value, c["grid_levels"],
+                c["grid_size"], c["grid_multiplier"], c["trade_size_multiplier"],
+                c["leverage"], c["tp_percent"]
+            )
+        })
+    return results
+
+
+def calc_verification_shared(output):
+    return normalize_levels(
+        output["grid"]["grid_levels"],
+        tp_price=output["tp_values"]["tp_price"],
+        average_entry=output["grid"]["average_entry"],
+        total_margin=output["grid"]["total_margin_required"]
+    )
+
+
+def audit_calculations_outputs(configs):
+    return [calculate_audit_grid(c) for c in configs]
+
+
+def audit_calculations_shared(output):
+    return normalize_levels(
+        output["grid_levels"],
+        tp_price=output["tp_price"],
+        average_entry=output["average_entry_price"],
+        total_margin=output["required_margin"]
+    )
+
+
+def verify_calculations_outputs(configs):
+    return [
+        verify_grid_calculations(
+            c["entry_price"], c["margin"], c["trade_size_percent"], c["leverage"],
+            c["grid_levels"], c["grid_size"], c["grid_multiplier"], c["trade_size_multiplier"]
+        )
+        for c in configs
+    ]
+
+
+def verify_calculations_shared(output):
+    # verify_grid_calculations returns None when the calculation raises
+    if output is None:
+        return None
+    return normalize_levels(
+        output["grid_levels"],
+        tp_price=output["tp_price"],
+        total_margin=output["required_margin"]
+    )
+
+
+def run_node(driver, stdin):
+    completed = subprocess.run(
+        ["node", "-e", driver, GRID_WORKER_FILE],
+        input=stdin,
+        capture_output=True,
+        check=True
+    )
+    return completed.stdout
+
+
+def app_outputs(configs):
+    packed = [[c[field] for field in CONFIG_FIELDS] for c in configs]
+    return json.loads(run_node(NODE_OUTPUT_DRIVER, json.dumps(packed).encode()))
+
+
+def app_shared(output):
+    levels = output["gridLevelsData"][1:]
+    return {
+        "prices": [float(level["price"]) for level in levels],
+        "trade_sizes": [float(level["tradeSize"]) for level in levels],
+        "position_sizes": [float(level["positionSize"]) for level in levels],
+        "pnl_at_tp": [float(level["pnlAtTp"]) for level in levels],
+        "tp_price": float(output["tpPrice"]),
+        "average_entry": float(output["averageEntryPrice"]),
+        "total_margin": float(output["totalTradeSize"])
+    }
+
+
+def app_shared_fast(configs):
+    """Shared fields of app_outputs() via packed doubles, avoiding JSON for large runs"""
+    packed = array("d", (c[field] for c in configs for field in CONFIG_FIELDS))
+    values = array("d")
+    values.frombytes(run_node(NODE_SHARED_DRIVER, packed.tobytes()))
+
+    results = []
+    offset = 0
+    for c in configs:
+        n = c["grid_levels"]
+        results.append({
+            "prices": values[offset:offset + n].tolist(),
+            "trade_sizes": values[offset + n:offset + 2 * n].tolist(),
+            "position_sizes": values[offset + 2 * n:offset + 3 * n].tolist(),
+            "pnl_at_tp": values[offset + 3 * n:offset + 4 * n].tolist(),
+            "tp_price": values[offset + 4 * n],
+            "average_entry": values[offset + 4 * n + 1],
+            "total_margin": values[offset + 4 * n + 2]
+        })
+        offset += 4 * n + 3
+    return results
+
+
+def shared_runner(run_outputs, to_shared):
+    return lambda configs: [to_shared(output) for output in run_outputs(configs)]
+
+
+def available_implementations():
+    """Return the runnable implementations and the reasons others were skipped
+
+    Each implementation maps to (run_outputs, to_shared, run_shared): run_outputs
+    returns its complete outputs for a list of configs, which the golden file pins;
+    to_shared reduces one output to the fields all implementations have in common;
+    run_shared returns those shared fields directly for the differential run.
+    """
+    implementations = {
+        "calc_verification": (
+            calc_verification_outputs,
+            calc_verification_shared,
+            shared_runner(calc_verification_outputs, calc_verification_shared)
+        ),
+        "audit_calculations": (
+            audit_calculations_outputs,
+            audit_calculations_shared,
+            shared_runner(audit_calculations_outputs, audit_calculations_shared)
+        )
+    }
+    skipped = {}
+
+    if verify_grid_calculations is not None:
+        implementations["verify_calculations"] = (
+            verify_calculations_outputs,
+            verify_calculations_shared,
+            shared_runner(verify_calculations_outputs, verify_calculations_shared)
+        )
+    else:
+        skipped["verify_calculations"] = VERIFY_IMPORT_ERROR
+
+    if shutil.which("node"):
+        implementations["app"] = (app_outputs, app_shared, app_shared_fast)
+    else:
+        skipped["app"] = "node not found on PATH"
+
+    return implementations, skipped
+
+
+def relative_difference(a, b):
+    if a == b:
+        return 0.0
+    if not (math.isfinite(a) and math.isfinite(b)):
+        # Matching infinities compare equal above; NaN only matches NaN
+        return 0.0 if math.isnan(a) and math.isnan(b) else math.inf
+    return abs(a - b) / max(abs(a), abs(b), 1e-12)
+
+
+def field_difference(a, b):
+    """Largest relative difference for a field, or None if the shapes differ"""
+    if a == b:
+        return 0.0
+    if isinstance(a, list):
+        if len(a) != len(b):
+            return None
+        differences = [abs(x - y) / max(abs(x), abs(y), 1e-12) for x, y in zip(a, b)]
+        if not math.isfinite(sum(differences)):
+            # NaN or infinity somewhere, take the slow path that handles them
+            differences = [relative_difference(x, y) for x, y in zip(a, b)]
+        return max(differences, default=0.0)
+    return relative_difference(a, b)
+
+
+def compare_results(expected, actual, abs_tolerances=None):
+    """Return {field: difference} for shared fields that differ beyond tolerance"""
+    if expected is None or actual is None:
+        return {} if expected is actual else {"failed": None}
+
+    abs_tolerances = abs_tolerances or {}
+    diverging = {}
+    for field in FIELDS:
+        if field not in expected or field not in actual:
+            continue
+        difference = field_difference(expected[field], actual[field])
+        if difference is None or difference > REL_TOLERANCE:
+            if field in abs_tolerances and abs(expected[field] - actual[field]) <= abs_tolerances[field]:
+                continue
+            diverging[field] = difference
+    return diverging
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def compare_outputs(expected, actual, path="$"):
+    """Return the paths at which two complete outputs differ beyond tolerance"""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        paths = [f"{path}.{key}" for key in sorted(expected.keys() ^ actual.keys())]
+        for key in sorted(expected.keys() & actual.keys()):
+            paths += compare_outputs(expected[key], actual[key], f"{path}.{key}")
+        return paths
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [f"{path} (length {len(expected)} != {len(actual)})"]
+        paths = []
+        for index, (e, a) in enumerate(zip(expected, actual)):
+            paths += compare_outputs(e, a, f"{path}[{index}]")
+        return paths
+    if is_number(expected) and is_number(actual):
+        return [] if relative_difference(expected, actual) <= REL_TOLERANCE else [path]
+    # Strings (formatted values, NaN/Infinity from the app), booleans and None must match exactly
+    return [] if type(expected) is type(actual) and expected == actual else [path]
+
+
+def comparison_tolerances(*names):
+    """Merge the rounding tolerances of the implementations being compared"""
+    tolerances = {}
+    for name in names:
+        tolerances.update(ROUNDING_TOLERANCES.get(name, {}))
+    return tolerances
+
+
+def property_violations(config, result):
+    """Check properties every grid calculator should satisfy"""
+    if result is None:
+        return ["calculation_failed"]
+    violations = []
+    prices = result["prices"]
+    if any(price <= 0 for price in prices):
+        violations.append("non_positive_price")
+    if any(lower >= upper for upper, lower in zip([config["entry_price"]] + prices, prices)):
+        violations.append("prices_not_descending")
+    if "average_entry" in result:
+        lowest = min(prices + [config["entry_price"]])
+        if not lowest * (1 - REL_TOLERANCE) <= result["average_entry"] <= config["entry_price"] * (1 + REL_TOLERANCE):
+            violations.append("average_entry_out_of_range")
+    return violations
+
+
+def run_all(runners, configs):
+    results = {}
+    timings = {}
+    for name, run in runners.items():
+        start = time.perf_counter()
+        results[name] = run(configs)
+        timings[name] = time.perf_counter() - start
+    return results, timings
+
+
+def load_golden():
+    if not os.path.exists(GOLDEN_FILE):
+        return None
+    with open(GOLDEN_FILE) as f:
+        return json.load(f)
+
+
+def update_golden(implementations, skipped):
+    configs = generate_golden_configs()
+    results, _ = run_all({name: impl[0] for name, impl in implementations.items()}, configs)
+
+    # Keep stored results for implementations that cannot run here
+    existing = load_golden()
+    if existing and [case["config"] for case in existing["cases"]] == configs:
+        for name in skipped:
+            if name in existing["cases"][0]["results"]:
+                results[name] = [case["results"][name] for case in existing["cases"]]
+
+    golden = {
+        "seed": GOLDEN_SEED,
+        "cases": [
+            {"config": config, "results": {name: results[name][index] for name in sorted(results)}}
+            for index, config in enumerate(configs)
+        ]
+    }
+    os.makedirs(os.path.dirname(GOLDEN_FILE), exist_ok=True)
+    with open(GOLDEN_FILE, "w") as f:
+        json.dump(golden, f, indent=1)
+        f.write("\n")
+    print(f"Wrote {GOLDEN_CASES} golden cases for {', '.join(sorted(results))} to {GOLDEN_FILE}")
+
+
+def check_golden(implementations):
+    """Compare each implementation's complete outputs against its golden results
+
+    Also checks that the shared fields used by the differential run agree with the
+    golden outputs. Returns the number of mismatching cases and the names of
+    implementations without golden results.
+    """
+    print("\nGolden File Check:")
+    print("=" * 50)
+
+    golden = load_golden()
+    if golden is None:
+        print(f"No golden file at {GOLDEN_FILE}, run with --update-golden")
+        return 0, sorted(implementations)
+
+    configs = [case["config"] for case in golden["cases"]]
+    results, _ = run_all({name: impl[0] for name, impl in implementations.items()}, configs)
+    shared_results, _ = run_all({name: impl[2] for name, impl in implementations.items()}, configs)
+    mismatches = 0
+    missing = []
+
+    for name in sorted(implementations):
+        if name not in golden["cases"][0]["results"]:
+            print(f"{name}: no golden results, run with --update-golden")
+            missing.append(name)
+            continue
+
+        to_shared = implementations[name][1]
+        failed = []
+        for index, case in enumerate(golden["cases"]):
+            paths = compare_outputs(case["results"][name], results[name][index])
+            expected_shared = to_shared(case["results"][name])
+            paths += [f"shared.{field}" for field in compare_results(expected_shared, shared_results[name][index])]
+            if paths:
+                failed.append((index, paths))
+
+        mismatches += len(failed)
+        if failed:
+            index, paths = failed[0]
+            more = f" (+{len(paths) - 5} more)" if len(paths) > 5 else ""
+            print(f"{name}: {len(failed)}/{len(configs)} cases differ from golden")
+            print(f"  First mismatch: case {index}, at {', '.join(paths[:5])}{more}")
+            print(f"  Config: {json.dumps(configs[index])}")
+        else:
+            print(f"{name}: {len(configs)}/{len(configs)} cases match")
+
+    return mismatches, missing
+
+
+def run_differential(implementations, seed, count):
+    print(f"\nDifferential Check ({count} random cases, seed {seed}):")
+    print("=" * 50)
+
+    configs = generate_configs(seed, count)
+    results, timings = run_all({name: impl[2] for name, impl in implementations.items()}, configs)
+
+    for name in sorted(timings):
+        print(f"{name}: {timings[name]:.2f}s")
+
+    reference = REFERENCE if REFERENCE in results else sorted(results)[0]
+    print(f"\nDivergence from {reference}:")
+    for name in sorted(results):
+        if name == reference:
+            continue
+        print(f"\n{name}:")
+
+        # field -> [diverging case count, largest difference, first case index]
+        divergences = {}
+        tolerances = comparison_tolerances(reference, name)
+        for index, (expected, actual) in enumerate(zip(results[reference], results[name])):
+            for field, difference in compare_results(expected, actual, tolerances).items():
+                stats = divergences.setdefault(field, [0, 0.0, index])
+                stats[0] += 1
+                if difference is None:
+                    stats[1] = float("inf")
+                else:
+                    stats[1] = max(stats[1], difference)
+
+        if not divergences:
+            print("  No divergence")
+        for field in FIELDS:
+            if field in divergences:
+                cases, largest, first = divergences[field]
+                print(f"  {field}: {cases}/{count} cases, max rel diff {largest:.2e}, first at case {first}")
+        if "failed" in divergences:
+            cases, _, first = divergences["failed"]
+            print(f"  failed on one side: {cases}/{count} cases, first at case {first}")
+
+    print("\nProperty Violations:")
+    for name in sorted(results):
+        counts = {}
+        for config, result in zip(configs, results[name]):
+            for violation in property_violations(config, result):
+                counts[violation] = counts.get(violation, 0) + 1
+        summary = ", ".join(f"{violation}: {cases}" for violation, cases in sorted(counts.items()))
+        print(f"{name}: {summary or 'none'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Differential audit of the grid calculators")
+    parser.add_argument("--cases", type=int, default=100000, help="number of random cases to compare")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the differential run")
+    parser.add_argument("--update-golden", action="store_true", help="regenerate the golden results")
+    parser.add_argument("--allow-skip", action="store_true",
+                        help="pass even if an implementation cannot run or has no golden results")
+    args = parser.parse_args()
+
+    implementations, skipped = available_implementations()
+    for name, reason in sorted(skipped.items()):
+        print(f"Skipping {name}: {reason}")
+
+    if args.update_golden:
+        if skipped and not args.allow_skip:
+            print("Refusing to write golden results without every implementation, use --allow-skip to override")
+            return 1
+        update_golden(implementations, skipped)
+        return 0
+
+    mismatches, missing = check_golden(implementations)
+    if args.cases > 0:
+        run_differential(implementations, args.seed, args.cases)
+
+    if mismatches:
+        return 1
+    if (skipped or missing) and not args.allow_skip:
+        print(f"\nNot checked: {', '.join(sorted(set(skipped) | set(missing)))} (use --allow-skip to pass anyway)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -72,51 +72,52 @@ def calculate_grid_levels(entry_price, initial_trade_value, grid_levels, grid_si
         'total_margin_required': total_margin_required
     }
 
-# Test with example values
-margin = 1000  # Initial capital
-trade_size_percent = 10  # Trade size percentage
-entry_price = 50  # Example entry price
-tp_percent = 10
-leverage = 3
-grid_levels = 3
-grid_size = 2
-grid_multiplier = 0.9
-trade_size_multiplier = 1.15
+if __name__ == "__main__":
+    # Test with example values
+    margin = 1000  # Initial capital
+    trade_size_percent = 10  # Trade size percentage
+    entry_price = 50  # Example entry price
+    tp_percent = 10
+    leverage = 3
+    grid_levels = 3
+    grid_size = 2
+    grid_multiplier = 0.9
+    trade_size_multiplier = 1.15
 
-# Calculate initial values
-initial_trade_value = calculate_initial_trade_value(margin, trade_size_percent)
-print(f"\nInitial Calculations:")
-print(f"Initial Trade Value: ${initial_trade_value}")
+    # Calculate initial values
+    initial_trade_value = calculate_initial_trade_value(margin, trade_size_percent)
+    print(f"\nInitial Calculations:")
+    print(f"Initial Trade Value: ${initial_trade_value}")
 
-tokens = calculate_token_amount(initial_trade_value, entry_price)
-print(f"Number of Tokens: {tokens}")
+    tokens = calculate_token_amount(initial_trade_value, entry_price)
+    print(f"Number of Tokens: {tokens}")
 
-# Calculate TP values
-tp_values = calculate_tp_values(entry_price, tp_percent, leverage, initial_trade_value)
-print("\nTP Calculations:")
-print(f"TP Price: ${tp_values['tp_price']:.2f}")
-print(f"Price Move to TP: ${tp_values['price_move_to_tp']:.2f}")
-print(f"Price Move to TP %: {tp_values['price_move_to_tp_percent']:.2f}%")
-print(f"TP Value: ${tp_values['tp_value']:.2f}")
+    # Calculate TP values
+    tp_values = calculate_tp_values(entry_price, tp_percent, leverage, initial_trade_value)
+    print("\nTP Calculations:")
+    print(f"TP Price: ${tp_values['tp_price']:.2f}")
+    print(f"Price Move to TP: ${tp_values['price_move_to_tp']:.2f}")
+    print(f"Price Move to TP %: {tp_values['price_move_to_tp_percent']:.2f}%")
+    print(f"TP Value: ${tp_values['tp_value']:.2f}")
 
-# Calculate grid levels
-grid_results = calculate_grid_levels(
-    entry_price, initial_trade_value, grid_levels, 
-    grid_size, grid_multiplier, trade_size_multiplier,
-    leverage, tp_percent
-)
+    # Calculate grid levels
+    grid_results = calculate_grid_levels(
+        entry_price, initial_trade_value, grid_levels, 
+        grid_size, grid_multiplier, trade_size_multiplier,
+        leverage, tp_percent
+    )
 
-print("\nGrid Level Calculations:")
-for level in grid_results['grid_levels']:
-    print(f"\nLevel {level['level']}:")
-    print(f"Price: ${level['price']:.2f}")
-    print(f"Grid Size: {level['grid_size']:.2f}%")
-    print(f"Trade Size: ${level['trade_size']:.2f}")
-    print(f"Position Size: ${level['position_size']:.2f}")
-    print(f"Required Margin: ${level['required_margin']:.2f}")
-    print(f"% From Entry: {level['percent_from_entry']:.2f}%")
-    print(f"PnL at TP: ${level['pnl_at_tp']:.2f}")
+    print("\nGrid Level Calculations:")
+    for level in grid_results['grid_levels']:
+        print(f"\nLevel {level['level']}:")
+        print(f"Price: ${level['price']:.2f}")
+        print(f"Grid Size: {level['grid_size']:.2f}%")
+        print(f"Trade Size: ${level['trade_size']:.2f}")
+        print(f"Position Size: ${level['position_size']:.2f}")
+        print(f"Required Margin: ${level['required_margin']:.2f}")
+        print(f"% From Entry: {level['percent_from_entry']:.2f}%")
+        print(f"PnL at TP: ${level['pnl_at_tp']:.2f}")
 
-print(f"\nFinal Results:")
-print(f"Average Entry: ${grid_results['average_entry']:.2f}")
-print(f"Total Margin Required: ${grid_results['total_margin_required']:.2f}")
+    print(f"\nFinal Results:")
+    print(f"Average Entry: ${grid_results['average_entry']:.2f}")
+    print(f"Total Margin Required: ${grid_results['total_margin_required']:.2f}")
@@ -0,0 +1,146 @@
+// Grid level calculations, kept free of DOM access so they can run off the main thread.
+// Loaded as a Web Worker this file answers params messages with { result } or { error };
+// loaded as a regular <script> it exposes computeGrid() for the main-thread fallback.
+
+function computeGrid(params) {
+    const {
+        entryPrice,
+        margin,
+        tradeSizePercent,
+        leverage,
+        gridLevels,
+        gridSize,
+        gridMultiplier,
+        tradeSizeMultiplier,
+        tpPercent,
+        manualInitialTradeValue,
+        manualTpValue,
+        useManualInitialTradeValue,
+        useManualTpValue,
+        decimalPlaces
+    } = params;
+
+    // Custom price formatter to match entry price decimals
+    const formatMatchingDecimals = (value) => {
+        return value.toFixed(decimalPlaces);
+    };
+
+    // Initial trade value is either typed in by the user or derived from margin
+    const initialTradeValue = useManualInitialTradeValue
+        ? manualInitialTradeValue
+        : (margin * tradeSizePercent) / 100;
+
+    // Calculate take profit values
+    const tpPrice = entryPrice * (1 + ((tpPercent / 100) / leverage));
+    const priceMoveToTP = tpPrice - entryPrice;
+    const priceMoveToTPPercent = ((tpPrice - entryPrice) / entryPrice) * 100;
+
+    // TP Value is the profit (percentage of initial trade value with leverage)
+    const tpValue = useManualTpValue
+        ? manualTpValue
+        : initialTradeValue * (tpPercent / 100) * leverage;
+
+    // Calculate grid levels
+    const gridLevelsData = [];
+    let totalTradeSize = initialTradeValue; // Include initial position
+    let totalWeightedPrice = entryPrice * initialTradeValue;
+    let totalPositionSize = initialTradeValue * leverage;
+
+    // Add level 0 (initial trade)
+    gridLevelsData.push({
+        level: 0,
+        price: formatMatchingDecimals(entryPrice),
+        gridSize: 0, // No grid size for initial trade
+        tradeSize: formatMatchingDecimals(initialTradeValue),
+        positionSize: formatMatchingDecimals(initialTradeValue * leverage),
+        requiredMargin: formatMatchingDecimals(initialTradeValue),
+        percentFromEntry: "0.00",
+        pnlAtTp: formatMatchingDecimals((tpPrice - entryPrice) * (initialTradeValue * leverage) / entryPrice)
+    });
+
+    let currentGridSize = gridSize;
+
+    for (let i = 0; i < gridLevels; i++) {
+        // Calculate grid size for this level (from entry price)
+        if (i > 0) {
+            currentGridSize = gridSize * Math.pow(gridMultiplier, i);
+        }
+
+        // Calculate price based on entry price (not previous level)
+        const priceLevel = entryPrice * (1 - ((currentGridSize * (i + 1)) / 100));
+
+        // Calculate trade size with linear scaling
+        // Add 1 to i so first grid level (-1) starts with the multiplier
+        const tradeSize = initialTradeValue * (1 + ((i + 1) * (tradeSizeMultiplier - 1)));
+
+        const positionSize = tradeSize * leverage;
+        const requiredMargin = tradeSize;
+        const percentFromEntry = ((priceLevel - entryPrice) / entryPrice) * 100;
+
+        // Calculate PnL at TP considering actual price movement from this level
+        const pnlAtTp = (tpPrice - priceLevel) * (positionSize / priceLevel);
+
+        gridLevelsData.push({
+            level: -(i + 1),
+            price: formatMatchingDecimals(priceLevel),
+            gridSize: currentGridSize,
+            tradeSize: formatMatchingDecimals(tradeSize),
+            positionSize: formatMatchingDecimals(positionSize),
+            requiredMargin: formatMatchingDecimals(requiredMargin),
+            percentFromEntry: percentFromEntry.toFixed(2),
+            pnlAtTp: formatMatchingDecimals(pnlAtTp)
+        });
+
+        totalTradeSize += tradeSize;
+        totalWeightedPrice += priceLevel * tradeSize;
+        totalPositionSize += positionSize;
+    }
+
+    // Calculate average entry and effective leverage
+    const averageEntryPrice = totalWeightedPrice / totalTradeSize;
+    const effectiveLeverage = totalPositionSize / totalTradeSize;
+
+    // Calculate number of tokens for initial trade (without leverage)
+    const tokenAmount = initialTradeValue / entryPrice;
+
+    // Calculate risk metrics
+    const liquidationPrice = entryPrice * (1 - (1 / leverage));
+    const maxDrawdown = ((entryPrice - liquidationPrice) / entryPrice) * 100;
+    const maxProfit = ((tpPrice - averageEntryPrice) / averageEntryPrice) * 100 * leverage;
+    const riskRewardRatio = Math.abs(maxProfit / maxDrawdown);
+    const marginUtilization = (totalTradeSize / margin) * 100;
+    const liquidationDistance = ((entryPrice - liquidationPrice) / entryPrice) * 100;
+
+    return {
+        initialTradeValue,
+        tpPrice,
+        priceMoveToTP,
+        priceMoveToTPPercent,
+        tpValue,
+        tokenAmount,
+        gridLevelsData,
+        totalTradeSize,
+        averageEntryPrice,
+        effectiveLeverage,
+        liquidationPrice,
+        maxDrawdown,
+        maxProfit,
+        riskRewardRatio,
+        marginUtilization,
+        liquidationDistance,
+        useManualInitialTradeValue,
+        useManualTpValue,
+        decimalPlaces
+    };
+}
+
+// Only register the message handler when running inside a worker
+if (typeof WorkerGlobalScope !== 'undefined' && self instanceof WorkerGlobalScope) {
+    self.onmessage = (event) => {
+        try {
+            self.postMessage({ result: computeGrid(event.data) });
+        } catch (error) {
+            self.postMessage({ error: error.message });
+        }
+    };
+}